@@ -1,249 +1,922 @@
-from nba_api.stats.endpoints import (
-    playercareerstats,
-    playergamelog,
-    teamgamelog,
-    leaguegamelog,
-    playerprofilev2,
-    leaguedashplayerstats,
-    leaguedashteamstats,
-    leaguehustlestatsplayer,
-    playerdashptshots,
-    hustlestatsboxscore,
-    boxscoreplayertrackv2,
-    boxscoreadvancedv2,
-    playervsplayer,
-    commonplayerinfo
-)
+from nba_api.stats.library.http import NBAStatsHTTP, STATS_HEADERS
 from nba_api.stats.library.parameters import SeasonAll
+from utils.cache import CACHE_POLICIES, conditional_headers, get_cache, make_key, validators_from
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+import asyncio
+import aiohttp
+import functools
+import importlib
+import io
 import logging
 import json
+import os
+import random
+import re
+import requests
+import tempfile
+import threading
+import time
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
 logger = logging.getLogger(__name__)
 
+_endpoint_modules: Dict[str, object] = {}
+
+def _lazy(name: str):
+    """Import an nba_api endpoint module on first use so unused endpoints cost nothing at startup."""
+    module = _endpoint_modules.get(name)
+    if module is None:
+        module = _endpoint_modules[name] = importlib.import_module(f"nba_api.stats.endpoints.{name}")
+    return module
+
+MAX_RETRIES = 3
+# Parquet copies of game logs, refreshed on the response cache's schedule
+LEAGUE_GAMES_PATH = os.path.join("cache", "league_gamelog_{season}.parquet")
+PLAYER_GAMES_PATH = os.path.join("cache", "player_gamelog_{player_id}_{season}.parquet")
+# Parquet schema metadata key holding the Unix time a stored table expires
+STORED_EXPIRY_KEY = b"nba_api_expires_at"
+# Seasons end up in those file names, so only the '2023-24' format is accepted
+SEASON_PATTERN = r"^\d{4}-\d{2}$"
+# Enough keep-alive connections for FastAPI's worker threads to share
+POOL_SIZE = 32
+# Server errors retried with exponential backoff, without slowing the rate limiter
+RETRY_STATUSES = (500, 502, 503, 504)
+BACKOFF_FACTOR = 0.5
+
+class AdaptiveLimiter:
+    """
+    Token bucket that adapts its rate to what stats.nba.com tolerates.
+
+    The allowed rate grows additively after each successful request and is
+    halved when a request times out or is throttled.
+    """
+
+    def __init__(self, rps: float = 5.0, min_rps: float = 0.5, max_rps: float = 10.0):
+        self.rps = rps
+        self.min_rps = min_rps
+        self.max_rps = max_rps
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available, else get how long to wait for one."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(max(1.0, self.rps), self._tokens + (now - self._updated) * self.rps)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rps
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait until a request may be sent without blocking the event loop."""
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rps = min(self.max_rps, self.rps + 0.1)
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self.rps = max(self.min_rps, self.rps * 0.5)
+
+_rate_limiter = AdaptiveLimiter()
+
+_session: Optional[requests.Session] = None
+
+def _get_session() -> requests.Session:
+    """Get the pooled keep-alive session shared by all sync requests."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update(STATS_HEADERS)
+        # Retries are left to _download so both loaders follow _retry_delay
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
+def _clear_session() -> None:
+    """Drop the shared session so the next request starts with fresh connections."""
+    global _session
+    if _session is not None:
+        _session.close()
+    _session = None
+
+# Requests currently being fetched, keyed like the response cache
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+def _retry_delay(attempt: int, status: Optional[int] = None, throttled: bool = False) -> Optional[float]:
+    """
+    Get how long to wait before retrying a failed request, or None to give up.
+
+    Throttled attempts (429s and timeouts) halve the shared request rate and
+    back off with jitter. Server errors and dropped connections (no status)
+    back off exponentially. Other statuses are not retried. Both loaders follow
+    this policy.
+    """
+    throttled = throttled or status == 429
+    if throttled:
+        _rate_limiter.on_failure()
+    elif status is not None and status not in RETRY_STATUSES:
+        return None
+    if attempt == MAX_RETRIES:
+        return None
+    return random.uniform(0, 2 ** attempt) if throttled else BACKOFF_FACTOR * 2 ** attempt
+
+def _url(endpoint) -> str:
+    return NBAStatsHTTP.base_url.format(endpoint=endpoint.endpoint)
+
+def _query(endpoint) -> List[Tuple[str, str]]:
+    """Get an endpoint's query parameters the way nba_api sends them: sorted, without None values."""
+    return [
+        (key, str(value))
+        for key, value in sorted(endpoint.parameters.items())
+        if value is not None
+    ]
+
+def _cached_response(endpoint) -> Optional[Tuple[str, Dict]]:
+    """Get the raw and parsed fresh response for an endpoint from the cache, if there is one."""
+    contents = get_cache().get(endpoint.endpoint, endpoint.parameters)
+    return (contents, _loads(contents)) if contents is not None else None
+
+def _revalidated(endpoint, validators: Optional[Dict[str, str]]) -> Optional[Tuple[str, Dict]]:
+    """Reuse the stale copy of a response stats.nba.com answered 304 for, if it is still stored."""
+    cache = get_cache()
+    contents = cache.get(endpoint.endpoint, endpoint.parameters, stale=True)
+    if contents is None:
+        return None
+    logger.info("%s not modified, reusing stored response", endpoint.endpoint)
+    cache.set(endpoint.endpoint, endpoint.parameters, contents, validators)
+    return contents, _loads(contents)
+
+def _stale_or_raise(endpoint, error: Exception) -> Tuple[str, Dict]:
+    """Serve the stale copy of a response whose request failed, or re-raise the failure."""
+    contents = get_cache().get(endpoint.endpoint, endpoint.parameters, stale=True)
+    if contents is None:
+        raise error
+    logger.warning("Serving stale %s response after error: %s", endpoint.endpoint, error)
+    return contents, _loads(contents)
+
+def _store(endpoint, text: str, validators: Optional[Dict[str, str]]) -> Tuple[str, Dict]:
+    """Parse a fresh response body and cache it with its validators."""
+    contents = NBAStatsHTTP().clean_contents(text)
+    data = _loads(contents)
+    get_cache().set(endpoint.endpoint, endpoint.parameters, contents, validators)
+    return contents, data
+
+def _download(endpoint, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """Request an endpoint from stats.nba.com, retrying failed attempts as _retry_delay decides."""
+    for attempt in range(MAX_RETRIES + 1):
+        _rate_limiter.acquire()
+        try:
+            response = _get_session().get(
+                _url(endpoint),
+                params=_query(endpoint),
+                headers=headers,
+                timeout=endpoint.timeout
+            )
+            response.raise_for_status()
+            break
+        except requests.HTTPError as e:
+            # The connection itself is fine, so the session is kept
+            delay = _retry_delay(attempt, status=e.response.status_code)
+            if delay is None:
+                raise
+        except requests.Timeout:
+            delay = _retry_delay(attempt, throttled=True)
+            if delay is None:
+                _clear_session()
+                raise
+        except requests.ConnectionError:
+            # A broken pooled connection can make every following request fail
+            _clear_session()
+            delay = _retry_delay(attempt)
+            if delay is None:
+                raise
+        logger.warning("%s failed, retrying in %.1fs (rate %.1f/s)", endpoint.endpoint, delay, _rate_limiter.rps)
+        time.sleep(delay)
+    _rate_limiter.on_success()
+    return response
+
+def _fetch(endpoint) -> Tuple[str, Dict]:
+    """Get the raw and parsed response for an endpoint from the cache or stats.nba.com."""
+    cached = _cached_response(endpoint)
+    if cached is not None:
+        return cached
+
+    # Revalidate the stale copy if stats.nba.com gave us an ETag or Last-Modified for it
+    validators = get_cache().get_validators(endpoint.endpoint, endpoint.parameters)
+    try:
+        response = _download(endpoint, conditional_headers(validators))
+        if response.status_code == 304:
+            revalidated = _revalidated(endpoint, validators)
+            if revalidated is not None:
+                return revalidated
+            response = _download(endpoint)
+    except requests.RequestException as e:
+        return _stale_or_raise(endpoint, e)
+    return _store(endpoint, response.text, validators_from(response.headers))
+
+def _make_api_request(endpoint_cls, **params) -> Dict:
+    """
+    Request an nba_api endpoint, serving the response from the cache when possible.
+
+    Concurrent calls for the same request wait on the first one instead of
+    sending their own.
+    """
+    endpoint = endpoint_cls(**params, get_request=False)
+    key = make_key(endpoint.endpoint, endpoint.parameters)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _inflight[key] = Future()
+
+    if not is_owner:
+        return _loads(future.result())
+
+    try:
+        contents, data = _fetch(endpoint)
+        future.set_result(contents)
+        return data
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+def _check_season(season: str) -> str:
+    """Raise ValueError unless a season has the '2023-24' format."""
+    if not re.match(SEASON_PATTERN, season):
+        raise ValueError(f"Invalid season '{season}', expected a format like '2023-24'")
+    return season
+
+def prune_stored_tables(max_age: float = CACHE_POLICIES["static"]) -> int:
+    """
+    Delete stored Parquet tables, and temp files left by crashed writes, not written within max_age seconds.
+
+    Tables are only rewritten when they are read, so the per-player files of
+    players nobody asks about any more would otherwise pile up in cache/.
+    Returns the number of files removed.
+    """
+    directory = os.path.dirname(PLAYER_GAMES_PATH)
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(directory):
+        if entry.name.endswith((".parquet", ".partial")) and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+def _stored_table(
+    path: str,
+    build: Callable[[], pa.Table],
+    expires_at: Callable[[], Optional[float]],
+    columns: Optional[List[str]] = None
+) -> pa.Table:
+    """
+    Read a table from its Parquet copy until it expires, else build and store it.
+
+    expires_at is called after build and gives when the response the table was
+    built from leaves the response cache; the copy expires with it, and isn't
+    stored when there is no fresh response. Only the given columns are read
+    back from disk.
+    """
+    if os.path.exists(path):
+        stored = pq.ParquetFile(path)
+        metadata = stored.schema_arrow.metadata or {}
+        if float(metadata.get(STORED_EXPIRY_KEY, 0)) > time.time():
+            return stored.read(columns=columns)
+
+    table = build()
+    expiry = expires_at()
+    if expiry is None:
+        return table.select(columns) if columns else table
+
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        STORED_EXPIRY_KEY: str(expiry).encode(),
+    })
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temporary file first so readers never see a partial table; its
+    # name is unique across worker processes as well as threads
+    partial = tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".partial", delete=False)
+    try:
+        with partial:
+            pq.write_table(table, partial, compression="zstd")
+        os.replace(partial.name, path)
+    except BaseException:
+        # Don't leave a half-written file behind in cache/
+        if os.path.exists(partial.name):
+            os.remove(partial.name)
+        raise
+    return table.select(columns) if columns else table
+
+@dataclass(slots=True, frozen=True)
+class ResultSet:
+    """One table from an NBA API response, without the request metadata."""
+    name: str
+    headers: Tuple[str, ...]
+    rows: List[Tuple]
+
+    @classmethod
+    def from_dict(cls, result_set: Dict) -> "ResultSet":
+        return cls(
+            name=result_set["name"],
+            headers=tuple(result_set["headers"]),
+            rows=[tuple(row) for row in result_set["rowSet"]]
+        )
+
+    def as_dict(self) -> Dict:
+        """Get the result set in the NBA API's own {name, headers, rowSet} shape."""
+        return {"name": self.name, "headers": list(self.headers), "rowSet": [list(row) for row in self.rows]}
+
+    def column(self, header: str) -> Tuple:
+        """Get every value of one column."""
+        index = self.headers.index(header)
+        return tuple(row[index] for row in self.rows)
+
+    def to_pandas(self) -> pd.DataFrame:
+        return pd.DataFrame(self.rows, columns=self.headers)
+
+    def to_polars(self):
+        import polars as pl
+        return pl.DataFrame(self.rows, schema=list(self.headers), orient="row")
+
+Response = Union[Dict, Dict[str, ResultSet], pa.Table, bytes]
+RETURN_FORMATS = ("dict", "resultsets", "arrow", "parquet-bytes")
+
+def _result_sets(data: Dict) -> List[Dict]:
+    result_sets = data["resultSets"] if "resultSets" in data else data["resultSet"]
+    return [result_sets] if isinstance(result_sets, dict) else result_sets
+
+def get_result_set(data: Dict, index: int = 0) -> Tuple[List[str], List[List]]:
+    """
+    Get the headers and rows of one result set from an NBA API response.
+
+    Raises ValueError if the response does not have the expected shape.
+    """
+    try:
+        result_set = _result_sets(data)[index]
+        return result_set["headers"], result_set["rowSet"]
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Invalid data received from NBA API: missing {str(e)}")
+
+# Player game logs date every game as e.g. 'APR 14, 2024'
+GAME_DATE_FORMAT = "%b %d, %Y"
+
+def parse_game_dates(dates: pd.Series) -> pd.Series:
+    """Parse game log GAME_DATE strings, converting each distinct date once."""
+    return pd.to_datetime(dates, format=GAME_DATE_FORMAT, cache=True)
+
+def _to_arrow(data: Dict) -> pa.Table:
+    """Convert the first result set of a response to an Arrow table."""
+    headers, rows = get_result_set(data)
+    df = pd.DataFrame(rows, columns=headers)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def _format_response(data: Dict, return_format: str) -> Response:
+    """
+    Convert a response dict to the requested format.
+
+    'dict' returns the response unchanged, 'resultsets' returns every result set
+    as a ResultSet keyed by name, 'arrow' returns the first result set as a
+    pyarrow Table and 'parquet-bytes' returns that table as zstd Parquet.
+    """
+    if return_format == "dict":
+        return data
+    if return_format not in RETURN_FORMATS:
+        raise ValueError(f"Invalid return_format '{return_format}', expected one of {RETURN_FORMATS}")
+    if return_format == "resultsets":
+        return {result_set["name"]: ResultSet.from_dict(result_set) for result_set in _result_sets(data)}
+    table = _to_arrow(data)
+    if return_format == "arrow":
+        return table
+    sink = io.BytesIO()
+    pq.write_table(table, sink, compression="zstd")
+    return sink.getvalue()
+
+def _fan_out(fetch: Callable[..., Dict], player_ids: Iterable[str], *args) -> Dict[str, Union[Dict, Exception]]:
+    """Run fetch(player_id, *args) for every player on a thread pool, keeping failures per player."""
+    results: Dict[str, Union[Dict, Exception]] = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {executor.submit(fetch, player_id, *args): player_id for player_id in player_ids}
+        for future in as_completed(futures):
+            player_id = futures[future]
+            try:
+                results[player_id] = future.result()
+            except Exception as e:
+                results[player_id] = e
+    return results
+
+@dataclass(frozen=True)
+class EndpointSpec:
+    """An nba_api endpoint and how a loader method's arguments map to its parameters."""
+    module_name: str
+    class_name: str
+    description: str
+    build_params: Callable[..., Dict]
+
+    def endpoint_cls(self):
+        return getattr(_lazy(self.module_name), self.class_name)
+
+    def params(self, *args, **kwargs) -> Dict:
+        """Get the endpoint parameters for a call, dropping None or empty values so nba_api's defaults apply."""
+        return {
+            key: value
+            for key, value in self.build_params(*args, **kwargs).items()
+            if value is not None and value != ""
+        }
+
+    def expires_at(self, *args, **kwargs) -> Optional[float]:
+        """Get when the response cache refetches a call's response, or None if it holds no fresh copy."""
+        endpoint = self.endpoint_cls()(**self.params(*args, **kwargs), get_request=False)
+        return get_cache().expires_at(endpoint.endpoint, endpoint.parameters)
+
+    def checked(self, data: Dict) -> Dict:
+        """Raise ValueError unless a response has result sets."""
+        if "resultSets" not in data and "resultSet" not in data:
+            raise ValueError(f"Invalid {self.description} data received from NBA API")
+        logger.info("Successfully retrieved %s. Data keys: %s", self.description, data.keys())
+        return data
+
+def nba_endpoint(module_name: str, class_name: str, description: str):
+    """
+    Turn a function that maps its arguments to endpoint parameters into a loader method.
+
+    The wrapped function returns the keyword arguments for the nba_api endpoint
+    class; None or empty values are dropped so nba_api's defaults apply. The
+    resulting method also accepts a keyword-only return_format, and keeps its
+    EndpointSpec as .nba_endpoint so async_endpoint can build its counterpart.
+    """
+    def decorator(build_params: Callable[..., Dict]) -> Callable[..., Response]:
+        spec = EndpointSpec(module_name, class_name, description, build_params)
+
+        @functools.wraps(build_params)
+        def wrapper(*args, return_format: str = "dict", **kwargs) -> Response:
+            params = spec.params(*args, **kwargs)
+            try:
+                logger.info("Fetching %s for %s", description, params)
+                data = spec.checked(_make_api_request(spec.endpoint_cls(), **params))
+                return _format_response(data, return_format)
+            except (requests.RequestException, KeyError, IndexError, ValueError) as e:
+                logger.error("Error fetching %s: %s", description, e)
+                raise
+
+        wrapper.nba_endpoint = spec
+        return wrapper
+    return decorator
+
 class NBADataLoader:
     @staticmethod
+    @nba_endpoint("playercareerstats", "PlayerCareerStats", "career stats")
     def get_player_career_stats(player_id: str) -> Dict:
         """Get career statistics for a specific player."""
-        try:
-            logger.info(f"Fetching career stats for player {player_id}")
-            career = playercareerstats.PlayerCareerStats(player_id=player_id)
-            data = career.get_dict()
-            logger.info(f"Successfully retrieved career stats. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching career stats: {str(e)}")
-            raise
+        return {"player_id": player_id}
 
     @staticmethod
+    @nba_endpoint("playergamelog", "PlayerGameLog", "game logs")
     def get_player_game_logs(player_id: str, season: Optional[str] = None) -> Dict:
         """Get game logs for a specific player. Season format: '2023-24'"""
-        try:
-            logger.info(f"Fetching game logs for player {player_id}, season {season}")
-            if season:
-                game_logs = playergamelog.PlayerGameLog(player_id=player_id, season=season)
-            else:
-                game_logs = playergamelog.PlayerGameLog(player_id=player_id)
-            
-            data = game_logs.get_dict()
-            logger.info(f"Successfully retrieved game logs. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching game logs: {str(e)}")
-            raise
+        return {"player_id": player_id, "season": season}
 
     @staticmethod
+    @nba_endpoint("playerprofilev2", "PlayerProfileV2", "advanced stats")
     def get_player_advanced_stats(player_id: str) -> Dict:
         """Get advanced statistics for a specific player."""
-        try:
-            logger.info(f"Fetching advanced stats for player {player_id}")
-            profile = playerprofilev2.PlayerProfileV2(player_id=player_id)
-            data = profile.get_dict()
-            logger.info(f"Successfully retrieved advanced stats. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching advanced stats: {str(e)}")
-            raise
+        return {"player_id": player_id}
 
     @staticmethod
+    @nba_endpoint("teamgamelog", "TeamGameLog", "team game logs")
     def get_team_game_logs(team_id: str, season: Optional[str] = None) -> Dict:
         """Get game logs for a specific team. Season format: '2023-24'"""
-        try:
-            logger.info(f"Fetching game logs for team {team_id}, season {season}")
-            if season:
-                team_logs = teamgamelog.TeamGameLog(team_id=team_id, season=season)
-            else:
-                team_logs = teamgamelog.TeamGameLog(team_id=team_id)
-            
-            data = team_logs.get_dict()
-            logger.info(f"Successfully retrieved team game logs. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching team game logs: {str(e)}")
-            raise
+        return {"team_id": team_id, "season": season}
 
     @staticmethod
+    @nba_endpoint("leaguedashplayerstats", "LeagueDashPlayerStats", "league player stats")
     def get_league_player_stats(season: Optional[str] = None) -> Dict:
         """Get league-wide player statistics. Season format: '2023-24'"""
-        try:
-            logger.info(f"Fetching league player stats for season {season}")
-            if season:
-                league_stats = leaguedashplayerstats.LeagueDashPlayerStats(season=season)
-            else:
-                league_stats = leaguedashplayerstats.LeagueDashPlayerStats()
-            
-            data = league_stats.get_dict()
-            logger.info(f"Successfully retrieved league player stats. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching league player stats: {str(e)}")
-            raise
+        return {"season": season}
 
     @staticmethod
-    def find_games_by_player(player_id: str, season: Optional[str] = None) -> Dict:
+    def find_games_by_player(player_id: str, season: Optional[str] = None) -> ResultSet:
         """Find all games played by a specific player. Season format: '2023-24'"""
-        try:
-            logger.info(f"Finding games for player {player_id}, season {season}")
-            if season:
-                game_finder = leaguegamelog.LeagueGameLog(
-                    player_id_nullable=player_id,
-                    season_nullable=season
-                )
-            else:
-                game_finder = leaguegamelog.LeagueGameLog(
-                    player_id_nullable=player_id
-                )
-            
-            data = game_finder.get_dict()
-            logger.info(f"Successfully retrieved games. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error finding games: {str(e)}")
-            raise
+        return NBADataLoader.get_games_by_players([player_id], season)[str(int(player_id))]
 
     @staticmethod
+    @nba_endpoint("commonplayerinfo", "CommonPlayerInfo", "player info")
     def get_player_info(player_id: str) -> Dict:
         """Get detailed player information including physical stats and experience."""
-        try:
-            logger.info(f"Fetching player info for player {player_id}")
-            info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
-            data = info.get_dict()
-            logger.info(f"Successfully retrieved player info. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching player info: {str(e)}")
-            raise
+        return {"player_id": player_id}
 
     @staticmethod
+    @nba_endpoint("playerdashptshots", "PlayerDashPtShots", "shot dashboard")
     def get_player_shot_dashboard(player_id: str, season: Optional[str] = None) -> Dict:
         """Get detailed shot statistics for a player."""
-        try:
-            logger.info(f"Fetching shot dashboard for player {player_id}, season {season}")
-            if season:
-                shots = playerdashptshots.PlayerDashPtShots(
-                    player_id=player_id,
-                    season_nullable=season
-                )
-            else:
-                shots = playerdashptshots.PlayerDashPtShots(
-                    player_id=player_id
-                )
-            
-            data = shots.get_dict()
-            logger.info(f"Successfully retrieved shot dashboard. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching shot dashboard: {str(e)}")
-            raise
+        return {"team_id": 0, "player_id": player_id, "season": season}
 
     @staticmethod
+    @nba_endpoint("hustlestatsboxscore", "HustleStatsBoxScore", "hustle stats")
     def get_player_hustle_stats(player_id: str, game_id: str) -> Dict:
         """Get hustle statistics for a player in a specific game."""
-        try:
-            logger.info(f"Fetching hustle stats for player {player_id}, game {game_id}")
-            hustle = hustlestatsboxscore.HustleStatsBoxScore(game_id=game_id)
-            data = hustle.get_dict()
-            logger.info(f"Successfully retrieved hustle stats. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching hustle stats: {str(e)}")
-            raise
+        return {"game_id": game_id}
 
     @staticmethod
+    @nba_endpoint("boxscoreplayertrackv2", "BoxScorePlayerTrackV2", "tracking stats")
     def get_player_tracking_stats(game_id: str) -> Dict:
         """Get player tracking statistics for a specific game."""
-        try:
-            logger.info(f"Fetching tracking stats for game {game_id}")
-            tracking = boxscoreplayertrackv2.BoxScorePlayerTrackV2(game_id=game_id)
-            data = tracking.get_dict()
-            logger.info(f"Successfully retrieved tracking stats. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching tracking stats: {str(e)}")
-            raise
+        return {"game_id": game_id}
 
     @staticmethod
+    @nba_endpoint("boxscoreadvancedv2", "BoxScoreAdvancedV2", "advanced box score")
     def get_advanced_box_score(game_id: str) -> Dict:
         """Get advanced box score statistics for a specific game."""
-        try:
-            logger.info(f"Fetching advanced box score for game {game_id}")
-            box_score = boxscoreadvancedv2.BoxScoreAdvancedV2(game_id=game_id)
-            data = box_score.get_dict()
-            logger.info(f"Successfully retrieved advanced box score. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching advanced box score: {str(e)}")
-            raise
+        return {"game_id": game_id}
 
     @staticmethod
+    @nba_endpoint("playervsplayer", "PlayerVsPlayer", "vs player stats")
     def get_player_vs_player_stats(player_id: str, vs_player_id: str) -> Dict:
         """Get head-to-head statistics between two players."""
-        try:
-            logger.info(f"Fetching vs player stats for player {player_id} vs {vs_player_id}")
-            vs_stats = playervsplayer.PlayerVsPlayer(
-                player_id=player_id,
-                vs_player_id=vs_player_id
-            )
-            data = vs_stats.get_dict()
-            logger.info(f"Successfully retrieved vs player stats. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching vs player stats: {str(e)}")
-            raise
+        return {"player_id": player_id, "vs_player_id": vs_player_id}
 
     @staticmethod
+    @nba_endpoint("leaguedashteamstats", "LeagueDashTeamStats", "team stats")
     def get_team_stats(season: Optional[str] = None) -> Dict:
         """Get comprehensive team statistics."""
-        try:
-            logger.info(f"Fetching team stats for season {season}")
-            if season:
-                team_stats = leaguedashteamstats.LeagueDashTeamStats(season=season)
-            else:
-                team_stats = leaguedashteamstats.LeagueDashTeamStats()
-            
-            data = team_stats.get_dict()
-            logger.info(f"Successfully retrieved team stats. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching team stats: {str(e)}")
-            raise
+        return {"season": season}
 
     @staticmethod
+    @nba_endpoint("leaguehustlestatsplayer", "LeagueHustleStatsPlayer", "league hustle stats")
     def get_league_hustle_stats(season: Optional[str] = None) -> Dict:
         """Get league-wide hustle statistics."""
-        try:
-            logger.info(f"Fetching league hustle stats for season {season}")
-            if season:
-                hustle_stats = leaguehustlestatsplayer.LeagueHustleStatsPlayer(season=season)
+        return {"season": season}
+
+    @staticmethod
+    @nba_endpoint("playergamelogs", "PlayerGameLogs", "game logs by date range")
+    def _get_player_game_logs_between(player_id: str, date_from: str, date_to: str) -> Dict:
+        return {"player_id_nullable": player_id, "date_from_nullable": date_from, "date_to_nullable": date_to}
+
+    @staticmethod
+    def get_player_game_logs_range(player_id: str, date_from: str, date_to: str) -> Dict[str, ResultSet]:
+        """
+        Get a player's game logs across several seasons with a single request.
+
+        Dates use the format 'MM/DD/YYYY'. Returns the games grouped by season
+        ('2023-24'), so e.g. the last five seasons take one call instead of one
+        get_player_game_logs call per season.
+        """
+        data = NBADataLoader._get_player_game_logs_between(player_id, date_from, date_to)
+        headers, rows = get_result_set(data)
+        season_index = headers.index("SEASON_YEAR")
+        by_season: Dict[str, List[Tuple]] = {}
+        for row in rows:
+            by_season.setdefault(row[season_index], []).append(tuple(row))
+        return {
+            season: ResultSet(name=season, headers=tuple(headers), rows=season_rows)
+            for season, season_rows in by_season.items()
+        }
+
+    @staticmethod
+    def get_player_game_log_table(
+        player_id: str,
+        season: Optional[str] = None,
+        columns: Optional[List[str]] = None
+    ) -> pa.Table:
+        """
+        Get a player's game logs as an Arrow table with GAME_DATE parsed. Season format: '2023-24'
+
+        The table is kept as Parquet under cache/ until its game log response
+        expires, so repeated analyses read just the columns they need instead
+        of re-parsing the JSON response.
+        """
+        season = _check_season(season or SeasonAll.current_season)
+
+        def build() -> pa.Table:
+            headers, rows = get_result_set(NBADataLoader.get_player_game_logs(player_id, season))
+            df = pd.DataFrame(rows, columns=headers)
+            df["GAME_DATE"] = parse_game_dates(df["GAME_DATE"])
+            return pa.Table.from_pandas(df, preserve_index=False)
+
+        return _stored_table(
+            PLAYER_GAMES_PATH.format(player_id=int(player_id), season=season),
+            build,
+            lambda: NBADataLoader.get_player_game_logs.nba_endpoint.expires_at(player_id, season),
+            columns
+        )
+
+    @staticmethod
+    @nba_endpoint("leaguegamelog", "LeagueGameLog", "league game log")
+    def _get_league_game_log(season: str) -> Dict:
+        return {"season": season, "player_or_team_abbreviation": "P"}
+
+    @staticmethod
+    def get_league_season_games(season: Optional[str] = None) -> pa.Table:
+        """
+        Get every player game of a season as one Arrow table. Season format: '2023-24'
+
+        The table is kept as Parquet under cache/ until its league game log
+        response expires, so per-player lookups are answered locally.
+        """
+        season = _check_season(season or SeasonAll.current_season)
+        return _stored_table(
+            LEAGUE_GAMES_PATH.format(season=season),
+            lambda: NBADataLoader._get_league_game_log(season, return_format="arrow"),
+            lambda: NBADataLoader._get_league_game_log.nba_endpoint.expires_at(season)
+        )
+
+    @staticmethod
+    def get_games_by_players(player_ids: Iterable[str], season: Optional[str] = None) -> Dict[str, ResultSet]:
+        """
+        Get the games of several players from the league-wide game log. Season format: '2023-24'
+
+        Costs at most one request per season however many players are asked for.
+        Returns a ResultSet per player ID; players without games get an empty one.
+        """
+        table = NBADataLoader.get_league_season_games(season)
+        ids = [int(player_id) for player_id in player_ids]
+        id_type = table.schema.field("PLAYER_ID").type
+        table = table.filter(pc.is_in(table["PLAYER_ID"], value_set=pa.array(ids, type=id_type)))
+
+        headers = tuple(table.column_names)
+        player_index = headers.index("PLAYER_ID")
+        games: Dict[int, List[Tuple]] = {player_id: [] for player_id in ids}
+        for row in zip(*(column.to_pylist() for column in table.columns)):
+            games[row[player_index]].append(row)
+        return {
+            str(player_id): ResultSet(name="LeagueGameLog", headers=headers, rows=rows)
+            for player_id, rows in games.items()
+        }
+
+    @staticmethod
+    def get_many_player_game_logs(
+        player_ids: List[str],
+        season: Optional[str] = None,
+        return_format: str = "dict"
+    ) -> Union[Dict[str, Union[Dict, Exception]], pa.Table]:
+        """
+        Get game logs for several players concurrently. Season format: '2023-24'
+
+        Returns a dict keyed by player ID. Players whose request failed map to the
+        raised exception so callers can retry only those IDs. With
+        return_format='arrow' the successful game logs are concatenated into one
+        table instead. Raises ValueError if every request failed.
+        """
+        logger.info("Fetching game logs for %s players, season %s", len(player_ids), season)
+        results = _fan_out(NBADataLoader.get_player_game_logs, player_ids, season)
+        return NBADataLoader._format_many(results, return_format)
+
+    @staticmethod
+    def get_many_player_career_stats(
+        player_ids: List[str],
+        return_format: str = "dict"
+    ) -> Union[Dict[str, Union[Dict, Exception]], pa.Table]:
+        """
+        Get career statistics for several players concurrently.
+
+        Returns a dict keyed by player ID. Players whose request failed map to the
+        raised exception so callers can retry only those IDs. With
+        return_format='arrow' the successful season totals are concatenated into
+        one table instead. Raises ValueError if every request failed.
+        """
+        logger.info("Fetching career stats for %s players", len(player_ids))
+        results = _fan_out(NBADataLoader.get_player_career_stats, player_ids)
+        return NBADataLoader._format_many(results, return_format)
+
+    @staticmethod
+    def _format_many(
+        results: Dict[str, Union[Dict, Exception]],
+        return_format: str
+    ) -> Union[Dict[str, Union[Dict, Exception]], pa.Table]:
+        if return_format == "dict":
+            return results
+        if return_format != "arrow":
+            raise ValueError(f"Invalid return_format '{return_format}', expected 'dict' or 'arrow'")
+        tables = []
+        failures = {}
+        for player_id, result in results.items():
+            if isinstance(result, Exception):
+                logger.warning("Skipping player %s: %s", player_id, result)
+                failures[player_id] = result
             else:
-                hustle_stats = leaguehustlestatsplayer.LeagueHustleStatsPlayer()
-            
-            data = hustle_stats.get_dict()
-            logger.info(f"Successfully retrieved league hustle stats. Data keys: {list(data.keys())}")
-            return data
-        except Exception as e:
-            logger.error(f"Error fetching league hustle stats: {str(e)}")
+                tables.append(_format_response(result, "arrow"))
+        if not tables:
+            if failures:
+                # There is no response to take the table's schema from
+                raise ValueError(
+                    f"Every player request failed: {', '.join(failures)}"
+                ) from next(iter(failures.values()))
+            return pa.table({})
+        return pa.concat_tables(tables, promote_options="default")
+
+
+def async_endpoint(method: Callable[..., Response]) -> classmethod:
+    """Build the AsyncNBADataLoader counterpart of a loader method made with nba_endpoint."""
+    spec = method.nba_endpoint
+
+    @functools.wraps(method)
+    async def wrapper(cls, *args, return_format: str = "dict", **kwargs) -> Response:
+        params = spec.params(*args, **kwargs)
+        try:
+            logger.info("Fetching %s for %s", spec.description, params)
+            data = spec.checked(await cls._request(spec.endpoint_cls(), **params))
+            return _format_response(data, return_format)
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, IndexError, ValueError) as e:
+            logger.error("Error fetching %s: %s", spec.description, e)
             raise
+
+    return classmethod(wrapper)
+
+
+class AsyncNBADataLoader:
+    """
+    Async counterpart of NBADataLoader.
+
+    All requests share one aiohttp session so several endpoints can be in flight
+    at once over pooled keep-alive connections. Call close() on shutdown.
+    """
+    _session: Optional[aiohttp.ClientSession] = None
+    # Requests currently being fetched, keyed like the response cache
+    _inflight: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def _get_session(cls) -> aiohttp.ClientSession:
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=75),
+                headers=STATS_HEADERS
+            )
+        return cls._session
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared session."""
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+
+    @classmethod
+    async def _request(cls, endpoint_cls, **params) -> Dict:
+        """
+        Build the request with nba_api's endpoint class and send it on the shared session.
+
+        Concurrent calls for the same request await the first one's fetch instead
+        of sending their own.
+        """
+        endpoint = endpoint_cls(**params, get_request=False)
+        key = make_key(endpoint.endpoint, endpoint.parameters)
+        task = cls._inflight.get(key)
+        is_owner = task is None
+        if is_owner:
+            task = cls._inflight[key] = asyncio.ensure_future(cls._fetch(endpoint))
+            task.add_done_callback(lambda _: cls._inflight.pop(key, None))
+        # Shielded so one cancelled caller does not abort the fetch for the others
+        contents, data = await asyncio.shield(task)
+        return data if is_owner else _loads(contents)
+
+    @classmethod
+    async def _download(
+        cls,
+        endpoint,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, str, Optional[Dict[str, str]]]:
+        """
+        Async _download: request an endpoint on the shared session, retrying as _retry_delay decides.
+
+        Gets the status, body and validators of the response. Error statuses raise
+        ClientResponseError so their body never reaches the cache.
+        """
+        timeout = aiohttp.ClientTimeout(total=endpoint.timeout)
+        for attempt in range(MAX_RETRIES + 1):
+            await _rate_limiter.acquire_async()
+            try:
+                async with cls._get_session().get(
+                    _url(endpoint), params=_query(endpoint), headers=headers, timeout=timeout
+                ) as response:
+                    if response.status != 304:
+                        response.raise_for_status()
+                    result = response.status, await response.text(), validators_from(response.headers)
+                break
+            except aiohttp.ClientResponseError as e:
+                delay = _retry_delay(attempt, status=e.status)
+                if delay is None:
+                    raise
+            except asyncio.TimeoutError:
+                delay = _retry_delay(attempt, throttled=True)
+                if delay is None:
+                    raise
+            except aiohttp.ClientConnectionError:
+                delay = _retry_delay(attempt)
+                if delay is None:
+                    raise
+            logger.warning("%s failed, retrying in %.1fs (rate %.1f/s)", endpoint.endpoint, delay, _rate_limiter.rps)
+            await asyncio.sleep(delay)
+        _rate_limiter.on_success()
+        return result
+
+    @classmethod
+    async def _fetch(cls, endpoint) -> Tuple[str, Dict]:
+        """
+        Async _fetch: get the raw and parsed response for an endpoint from the cache or the shared session.
+
+        Cache reads and writes block on SQLite or Redis, so they run off the event loop.
+        """
+        cached = await asyncio.to_thread(_cached_response, endpoint)
+        if cached is not None:
+            return cached
+
+        cache = get_cache()
+        validators = await asyncio.to_thread(cache.get_validators, endpoint.endpoint, endpoint.parameters)
+        try:
+            status, text, new_validators = await cls._download(endpoint, conditional_headers(validators))
+            if status == 304:
+                revalidated = await asyncio.to_thread(_revalidated, endpoint, validators)
+                if revalidated is not None:
+                    return revalidated
+                status, text, new_validators = await cls._download(endpoint)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return await asyncio.to_thread(_stale_or_raise, endpoint, e)
+        return await asyncio.to_thread(_store, endpoint, text, new_validators)
+
+    get_player_career_stats = async_endpoint(NBADataLoader.get_player_career_stats)
+    get_player_game_logs = async_endpoint(NBADataLoader.get_player_game_logs)
+    get_player_advanced_stats = async_endpoint(NBADataLoader.get_player_advanced_stats)
+    get_team_game_logs = async_endpoint(NBADataLoader.get_team_game_logs)
+    get_league_player_stats = async_endpoint(NBADataLoader.get_league_player_stats)
+    get_player_info = async_endpoint(NBADataLoader.get_player_info)
+    get_player_shot_dashboard = async_endpoint(NBADataLoader.get_player_shot_dashboard)
+    get_player_hustle_stats = async_endpoint(NBADataLoader.get_player_hustle_stats)
+    get_player_tracking_stats = async_endpoint(NBADataLoader.get_player_tracking_stats)
+    get_advanced_box_score = async_endpoint(NBADataLoader.get_advanced_box_score)
+    get_player_vs_player_stats = async_endpoint(NBADataLoader.get_player_vs_player_stats)
+    get_team_stats = async_endpoint(NBADataLoader.get_team_stats)
+    get_league_hustle_stats = async_endpoint(NBADataLoader.get_league_hustle_stats)
+
+    @classmethod
+    async def gather_player_bundle(cls, player_id: str, season: Optional[str] = None) -> Dict:
+        """Fetch career stats, game logs, profile, info and shots for a player concurrently."""
+        career, game_logs, advanced, info, shots = await asyncio.gather(
+            cls.get_player_career_stats(player_id),
+            cls.get_player_game_logs(player_id, season),
+            cls.get_player_advanced_stats(player_id),
+            cls.get_player_info(player_id),
+            cls.get_player_shot_dashboard(player_id, season)
+        )
+        return {
+            "career": career,
+            "game_logs": game_logs,
+            "advanced": advanced,
+            "info": info,
+            "shots": shots
+        }
+
+    @classmethod
+    async def prefetch(cls, seasons: List[str]) -> Dict[str, Optional[Exception]]:
+        """
+        Warm the response cache with the league-wide tables for each season.
+
+        Returns a dict mapping "<table> <season>" to None on success or the raised
+        exception on failure.
+        """
+        requests_by_name = {}
+        for season in seasons:
+            requests_by_name[f"league player stats {season}"] = cls.get_league_player_stats(season)
+            requests_by_name[f"team stats {season}"] = cls.get_team_stats(season)
+            requests_by_name[f"league hustle stats {season}"] = cls.get_league_hustle_stats(season)
+        logger.info("Prefetching %s tables for seasons %s", len(requests_by_name), seasons)
+        results = await asyncio.gather(*requests_by_name.values(), return_exceptions=True)
+        return {
+            name: result if isinstance(result, Exception) else None
+            for name, result in zip(requests_by_name, results)
+        }
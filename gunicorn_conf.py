@@ -0,0 +1,20 @@
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8002")
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = True
+
+keepalive = 75
+# Recycle workers periodically so a leak in one cannot grow without bound
+max_requests = 1000
+max_requests_jitter = 100
+
+
+def post_fork(server, worker):
+    # Cache connections are opened lazily; make sure none made while preloading
+    # are shared between workers
+    from utils.cache import reset_cache
+    reset_cache()
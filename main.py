@@ -1,13 +1,66 @@
-from fastapi import FastAPI, HTTPException
-from data.data_loader import NBADataLoader
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
+from data.data_loader import SEASON_PATTERN, AsyncNBADataLoader, NBADataLoader
 from utils.hit_rate_calculator import HitRateCalculator
 from utils.prop_analyzer import PropAnalyzer
-from typing import Optional
+from typing import Any, Optional
+import asyncio
+import msgspec
+import orjson
+import os
+
+class NumpyORJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also serializes NumPy scalars and arrays.
+
+    FastAPI runs jsonable_encoder on plain return values, which rejects NumPy
+    types, so routes must return an instance of this response themselves.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+class MsgspecResponse(Response):
+    """Encodes msgspec Structs, such as HitRates, directly without FastAPI's jsonable_encoder pass."""
+    media_type = "application/json"
+    encoder = msgspec.json.Encoder()
+
+    def render(self, content: Any) -> bytes:
+        return self.encoder.encode(content)
+
+# Caps requests in flight to stats.nba.com across all handlers
+NBA_MAX_CONCURRENCY = int(os.getenv("NBA_MAX_CONCURRENCY", "16"))
+# Seconds a request waits for a free slot before it is rejected with 429
+NBA_QUEUE_TIMEOUT = float(os.getenv("NBA_QUEUE_TIMEOUT", "10"))
+_nba_semaphore = asyncio.Semaphore(NBA_MAX_CONCURRENCY)
+# Comma-separated numeric player IDs, e.g. '203999,201939'
+PLAYER_IDS_PATTERN = r"^\d+(,\d+)*$"
+
+@asynccontextmanager
+async def _nba_slot():
+    """Hold one of the NBA_MAX_CONCURRENCY upstream slots, or fail with 429 after NBA_QUEUE_TIMEOUT."""
+    try:
+        await asyncio.wait_for(_nba_semaphore.acquire(), timeout=NBA_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=429, detail="Too many concurrent requests, try again later")
+    try:
+        yield
+    finally:
+        _nba_semaphore.release()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await AsyncNBADataLoader.close()
 
 app = FastAPI(
     title="NBA Stats API",
     description="API for retrieving NBA player statistics for projection modeling",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=NumpyORJSONResponse,
+    lifespan=lifespan
 )
 
 @app.get("/")
@@ -17,120 +70,143 @@ async def root():
 @app.get("/player/career/{player_id}")
 async def get_player_career_stats(player_id: str):
     """Get career statistics for a specific player"""
-    try:
-        return NBADataLoader.get_player_career_stats(player_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_player_career_stats(player_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/games/{player_id}")
-async def get_player_game_logs(player_id: str, season: Optional[str] = None):
+async def get_player_game_logs(player_id: str, season: Optional[str] = Query(None, pattern=SEASON_PATTERN)):
     """Get game logs for a specific player"""
-    try:
-        return NBADataLoader.get_player_game_logs(player_id, season)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_player_game_logs(player_id, season)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/advanced/{player_id}")
 async def get_player_advanced_stats(player_id: str):
     """Get advanced statistics for a specific player"""
-    try:
-        return NBADataLoader.get_player_advanced_stats(player_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_player_advanced_stats(player_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/team/games/{team_id}")
-async def get_team_game_logs(team_id: str, season: Optional[str] = None):
+async def get_team_game_logs(team_id: str, season: Optional[str] = Query(None, pattern=SEASON_PATTERN)):
     """Get game logs for a specific team"""
-    try:
-        return NBADataLoader.get_team_game_logs(team_id, season)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_team_game_logs(team_id, season)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/league/players")
-async def get_league_player_stats(season: Optional[str] = None):
+async def get_league_player_stats(season: Optional[str] = Query(None, pattern=SEASON_PATTERN)):
     """Get league-wide player statistics"""
-    try:
-        return NBADataLoader.get_league_player_stats(season)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_league_player_stats(season)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/find-games/{player_id}")
-async def find_games_by_player(player_id: str, season: Optional[str] = None):
+async def find_games_by_player(player_id: str, season: Optional[str] = Query(None, pattern=SEASON_PATTERN)):
     """Find all games played by a specific player"""
-    try:
-        return NBADataLoader.find_games_by_player(player_id, season)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await run_in_threadpool(NBADataLoader.find_games_by_player, player_id, season)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/players/bulk-games")
+async def get_games_by_players(player_ids: str, season: Optional[str] = Query(None, pattern=SEASON_PATTERN)):
+    """Get the games of several players, given as comma-separated IDs, from one league-wide game log"""
+    async with _nba_slot():
+        try:
+            return await run_in_threadpool(NBADataLoader.get_games_by_players, player_ids.split(","), season)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/info/{player_id}")
 async def get_player_info(player_id: str):
     """Get detailed player information"""
-    try:
-        return NBADataLoader.get_player_info(player_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_player_info(player_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/shots/{player_id}")
-async def get_player_shot_dashboard(player_id: str, season: Optional[str] = None):
+async def get_player_shot_dashboard(player_id: str, season: Optional[str] = Query(None, pattern=SEASON_PATTERN)):
     """Get detailed shot statistics for a player"""
-    try:
-        return NBADataLoader.get_player_shot_dashboard(player_id, season)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_player_shot_dashboard(player_id, season)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/hustle/{game_id}")
 async def get_player_hustle_stats(game_id: str):
     """Get hustle statistics for players in a specific game"""
-    try:
-        return NBADataLoader.get_player_hustle_stats(game_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_player_hustle_stats(player_id=None, game_id=game_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/game/tracking/{game_id}")
 async def get_player_tracking_stats(game_id: str):
     """Get player tracking statistics for a specific game"""
-    try:
-        return NBADataLoader.get_player_tracking_stats(game_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_player_tracking_stats(game_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/game/advanced/{game_id}")
 async def get_advanced_box_score(game_id: str):
     """Get advanced box score statistics for a specific game"""
-    try:
-        return NBADataLoader.get_advanced_box_score(game_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_advanced_box_score(game_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/vs/{player_id}/{vs_player_id}")
 async def get_player_vs_player_stats(player_id: str, vs_player_id: str):
     """Get head-to-head statistics between two players"""
-    try:
-        return NBADataLoader.get_player_vs_player_stats(player_id, vs_player_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_player_vs_player_stats(player_id, vs_player_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/team/stats")
-async def get_team_stats(season: Optional[str] = None):
+async def get_team_stats(season: Optional[str] = Query(None, pattern=SEASON_PATTERN)):
     """Get comprehensive team statistics"""
-    try:
-        return NBADataLoader.get_team_stats(season)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_team_stats(season)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/league/hustle")
-async def get_league_hustle_stats(season: Optional[str] = None):
+async def get_league_hustle_stats(season: Optional[str] = Query(None, pattern=SEASON_PATTERN)):
     """Get league-wide hustle statistics"""
-    try:
-        return NBADataLoader.get_league_hustle_stats(season)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return await AsyncNBADataLoader.get_league_hustle_stats(season)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/player/hit-rates/{player_id}")
+@app.get("/player/hit-rates/{player_id}", response_class=MsgspecResponse)
 async def get_player_hit_rates(
     player_id: str,
     num_games: Optional[int] = 10,
-    season: Optional[str] = None
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN)
 ):
     """
     Get hit rates for various statistical thresholds over the last N games
@@ -143,15 +219,40 @@ async def get_player_hit_rates(
     Returns:
     Hit rates for points, assists, rebounds, three-pointers, steals, and blocks
     """
-    try:
-        return HitRateCalculator.get_player_hit_rates(player_id, num_games, season)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return MsgspecResponse(
+                await run_in_threadpool(HitRateCalculator.get_player_hit_rates, player_id, num_games, season)
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/players/hit-rates", response_class=MsgspecResponse)
+async def get_many_player_hit_rates(
+    ids: str = Query(..., pattern=PLAYER_IDS_PATTERN),
+    num_games: Optional[int] = 10,
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN)
+):
+    """
+    Get hit rates for several players with a single league-wide game log request
+    
+    Parameters:
+    - ids: Comma-separated NBA player IDs
+    - num_games: Number of most recent games to analyze per player (default: 10)
+    - season: NBA season in format '2023-24' (optional)
+    """
+    async with _nba_slot():
+        try:
+            return MsgspecResponse(
+                await run_in_threadpool(HitRateCalculator.get_many_player_hit_rates, ids.split(","), num_games, season)
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/home-away/{player_id}")
 async def get_home_away_splits(
     player_id: str,
-    season: Optional[str] = None,
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN),
     last_n_games: Optional[int] = None
 ):
     """
@@ -161,15 +262,18 @@ async def get_home_away_splits(
     - If last_n_games is provided, analyzes only the most recent N games
     - If neither is provided, analyzes all games from the current season
     """
-    try:
-        return PropAnalyzer.calculate_home_away_splits(player_id, season, last_n_games)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return NumpyORJSONResponse(
+                await run_in_threadpool(PropAnalyzer.calculate_home_away_splits, player_id, season, last_n_games)
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/rest-impact/{player_id}")
 async def get_rest_day_impact(
     player_id: str,
-    season: Optional[str] = None,
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN),
     last_n_games: Optional[int] = None
 ):
     """
@@ -179,16 +283,19 @@ async def get_rest_day_impact(
     - If last_n_games is provided, analyzes only the most recent N games
     - If neither is provided, analyzes all games from the current season
     """
-    try:
-        return PropAnalyzer.calculate_rest_day_impact(player_id, season, last_n_games)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return NumpyORJSONResponse(
+                await run_in_threadpool(PropAnalyzer.calculate_rest_day_impact, player_id, season, last_n_games)
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/matchup-history/{player_id}/{opponent_team_id}")
 async def get_matchup_history(
     player_id: str,
     opponent_team_id: str,
-    season: Optional[str] = None,
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN),
     last_n_matchups: Optional[int] = 5
 ):
     """
@@ -198,16 +305,19 @@ async def get_matchup_history(
     - last_n_matchups determines how many recent matchups to analyze (default: 5)
     - If season is not provided, analyzes matchups across all available seasons
     """
-    try:
-        return PropAnalyzer.analyze_matchup_history(player_id, opponent_team_id, season, last_n_matchups)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return NumpyORJSONResponse(
+                await run_in_threadpool(PropAnalyzer.analyze_matchup_history, player_id, opponent_team_id, season, last_n_matchups)
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/consistency/{player_id}/{stat_type}")
 async def get_consistency_score(
     player_id: str,
     stat_type: str,
-    season: Optional[str] = None,
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN),
     last_n_games: int = 20
 ):
     """
@@ -218,15 +328,18 @@ async def get_consistency_score(
     - last_n_games determines how many recent games to analyze (default: 20)
     - If season is not provided, analyzes games from the current season
     """
-    try:
-        return PropAnalyzer.calculate_consistency_score(player_id, stat_type, season, last_n_games)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return NumpyORJSONResponse(
+                await run_in_threadpool(PropAnalyzer.calculate_consistency_score, player_id, stat_type, season, last_n_games)
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player/pace-impact/{player_id}")
 async def get_pace_impact(
     player_id: str,
-    season: Optional[str] = None,
+    season: Optional[str] = Query(None, pattern=SEASON_PATTERN),
     last_n_games: int = 20
 ):
     """
@@ -236,10 +349,13 @@ async def get_pace_impact(
     - last_n_games determines how many recent games to analyze (default: 20)
     - If season is not provided, analyzes games from the current season
     """
-    try:
-        return PropAnalyzer.analyze_pace_impact(player_id, season, last_n_games)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with _nba_slot():
+        try:
+            return NumpyORJSONResponse(
+                await run_in_threadpool(PropAnalyzer.analyze_pace_impact, player_id, season, last_n_games)
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
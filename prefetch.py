@@ -0,0 +1,35 @@
+"""
+Warm the NBA API response cache before the server starts taking traffic.
+
+Usage: python prefetch.py [SEASON ...]   (defaults to the current and previous season)
+
+Exits with status 1 if any table could not be fetched, so it can be used as a
+container startup probe. Also deletes stored Parquet tables nobody has read for
+30 days.
+"""
+from data.data_loader import AsyncNBADataLoader, prune_stored_tables
+from nba_api.stats.library.parameters import Season
+import asyncio
+import sys
+
+
+async def run(seasons):
+    try:
+        return await AsyncNBADataLoader.prefetch(seasons)
+    finally:
+        await AsyncNBADataLoader.close()
+
+
+def main() -> int:
+    seasons = sys.argv[1:] or [Season.current_season, Season.previous_season]
+    results = asyncio.run(run(seasons))
+    failures = {name: error for name, error in results.items() if error is not None}
+    for name, error in failures.items():
+        print(f"Failed to prefetch {name}: {error}", file=sys.stderr)
+    print(f"Prefetched {len(results) - len(failures)}/{len(results)} tables")
+    print(f"Pruned {prune_stored_tables()} stored tables")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+import pyarrow as pa
+
+from utils import prop_analyzer
+from utils.prop_analyzer import PropAnalyzer
+
+
+def _game_logs(fga):
+    """Build an Arrow-backed game log frame like _build_df's, one game per FGA value."""
+    n = len(fga)
+    table = pa.table({
+        'FGA': pa.array(fga, type=pa.int64()),
+        'OREB': pa.array([1] * n, type=pa.int64()),
+        'TOV': pa.array([2] * n, type=pa.int64()),
+        'PTS': pa.array(range(10, 10 + n), type=pa.int64()),
+        'AST': pa.array([5] * n, type=pa.int64()),
+        'REB': pa.array([7] * n, type=pa.int64()),
+        'MIN': pa.array([30.0] * n),
+    })
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+class AnalyzePaceImpactTest(unittest.TestCase):
+    def test_null_field_goal_attempts_are_left_out(self):
+        df = _game_logs([10, 11, 12, None, 13, 14, 15, 16, 17, 18])
+        with mock.patch.object(prop_analyzer, '_cached_frame', return_value=(time.time() + 60, df)):
+            stats = PropAnalyzer.analyze_pace_impact('pace-null-fga', None, 20)
+
+        self.assertEqual(sum(bucket["games_played"] for bucket in stats.values()), 9)
+        self.assertEqual(
+            {pace_type: bucket["games_played"] for pace_type, bucket in stats.items()},
+            {"high_pace": 3, "medium_pace": 3, "low_pace": 3}
+        )
+        for bucket in stats.values():
+            for value in bucket.values():
+                self.assertIsInstance(value, (int, float))
+
+    def test_missing_averages_are_none(self):
+        df = _game_logs([10, 11, 12])
+        df['AST'] = pd.array([None] * 3, dtype=pd.ArrowDtype(pa.int64()))
+        with mock.patch.object(prop_analyzer, '_cached_frame', return_value=(time.time() + 60, df)):
+            stats = PropAnalyzer.analyze_pace_impact('pace-null-ast', None, 20)
+
+        self.assertTrue(stats)
+        for bucket in stats.values():
+            self.assertIsNone(bucket["avg_assists"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+from typing import Dict, Optional
+from nba_api.stats.library.parameters import Season
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import zstandard
+
+    ZSTD = True
+except ImportError:
+    ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+CACHE_POLICIES = {
+    "short": 30,            # live box score data
+    "normal": 5 * MINUTE,   # current-season data
+    "long": DAY,            # career totals and matchups
+    "static": 30 * DAY,     # player bios and finished seasons
+}
+
+# Endpoints whose freshness does not depend on the season parameter
+ENDPOINT_POLICIES = {
+    "commonplayerinfo": "static",
+    "playercareerstats": "long",
+    "playerprofilev2": "long",
+    "playervsplayer": "long",
+    "hustlestatsboxscore": "short",
+    "boxscoreplayertrackv2": "short",
+    "boxscoreadvancedv2": "short",
+}
+
+# Stale copies outlive fresh entries so they can stand in when stats.nba.com fails
+STALE_FACTOR = 10
+
+ZSTD_LEVEL = 3
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def make_key(endpoint: str, parameters: Dict) -> str:
+    """Build a cache key from the endpoint name and its sorted parameters."""
+    raw = f"{endpoint}?" + "&".join(f"{key}={value}" for key, value in sorted(parameters.items()))
+    return "nba:" + hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _dumps(contents: str) -> bytes:
+    """Encode a response body for storage, zstd-compressing it when zstandard is installed."""
+    body = contents.encode("utf-8")
+    return zstandard.compress(body, ZSTD_LEVEL) if ZSTD else body
+
+
+def _loads(body: bytes) -> str:
+    """Decode a stored response body, whether or not it was compressed."""
+    if body[:4] == ZSTD_MAGIC:
+        body = zstandard.decompress(body)
+    return body.decode("utf-8")
+
+
+def policy_for(endpoint: str, parameters: Dict) -> str:
+    """Get the name of the cache policy that applies to a request."""
+    if endpoint in ENDPOINT_POLICIES:
+        return ENDPOINT_POLICIES[endpoint]
+    season = parameters.get("Season")
+    if season and season != Season.current_season:
+        return "static"
+    return "normal"
+
+
+def validators_from(headers) -> Optional[Dict[str, str]]:
+    """Get the ETag and Last-Modified headers of a response, if it sent any."""
+    validators = {
+        name: headers[header]
+        for name, header in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+        if headers.get(header)
+    }
+    return validators or None
+
+
+def conditional_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Build the headers that ask stats.nba.com to answer 304 if a stored response is unchanged."""
+    headers = {}
+    if validators and "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if validators and "last_modified" in validators:
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def ttl_for(endpoint: str, parameters: Dict) -> int:
+    """Get the cache lifetime in seconds for a request."""
+    return CACHE_POLICIES[policy_for(endpoint, parameters)]
+
+
+class SQLiteBackend:
+    """File-backed cache for local development."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, body: bytes, ttl: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, expires_at) VALUES (?, ?, ?)",
+                (key, body, time.time() + ttl)
+            )
+            self._conn.commit()
+
+    def expires_at(self, key: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        return row[0]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+
+class RedisBackend:
+    """Redis-backed cache shared by every worker in production."""
+
+    def __init__(self, url: str):
+        import redis
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, body: bytes, ttl: int) -> None:
+        self._client.setex(key, ttl, body)
+
+    def expires_at(self, key: str) -> Optional[float]:
+        remaining = self._client.pttl(key)
+        # pttl is -2 for a missing key and -1 for one without an expiry
+        return time.time() + remaining / 1000 if remaining > 0 else None
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+
+class ResponseCache:
+    """Caches raw stats.nba.com response bodies keyed on endpoint and parameters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, endpoint: str, parameters: Dict, stale: bool = False) -> Optional[str]:
+        """Get a fresh response body, or with stale=True the longer-lived fallback copy."""
+        key = make_key(endpoint, parameters)
+        try:
+            body = self.backend.get(key + ":stale" if stale else key)
+        except Exception as e:
+            logger.warning("Cache read failed for %s: %s", endpoint, e)
+            return None
+        return _loads(body) if body is not None else None
+
+    def get_validators(self, endpoint: str, parameters: Dict) -> Optional[Dict[str, str]]:
+        """Get the ETag/Last-Modified validators stored with the stale copy of a response."""
+        try:
+            body = self.backend.get(make_key(endpoint, parameters) + ":validators")
+        except Exception as e:
+            logger.warning("Cache read failed for %s: %s", endpoint, e)
+            return None
+        return json.loads(body) if body is not None else None
+
+    def expires_at(self, endpoint: str, parameters: Dict) -> Optional[float]:
+        """Get the Unix time the fresh copy of a response expires, or None if there is no fresh copy."""
+        try:
+            return self.backend.expires_at(make_key(endpoint, parameters))
+        except Exception as e:
+            logger.warning("Cache read failed for %s: %s", endpoint, e)
+            return None
+
+    def set(
+        self,
+        endpoint: str,
+        parameters: Dict,
+        contents: str,
+        validators: Optional[Dict[str, str]] = None
+    ) -> None:
+        key = make_key(endpoint, parameters)
+        body = _dumps(contents)
+        ttl = ttl_for(endpoint, parameters)
+        try:
+            self.backend.set(key, body, ttl)
+            self.backend.set(key + ":stale", body, ttl * STALE_FACTOR)
+            if validators:
+                self.backend.set(key + ":validators", json.dumps(validators).encode("utf-8"), ttl * STALE_FACTOR)
+            else:
+                # Drop validators from an earlier response so they cannot revalidate this body
+                self.backend.delete(key + ":validators")
+        except Exception as e:
+            logger.warning("Cache write failed for %s: %s", endpoint, e)
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_cache() -> ResponseCache:
+    """
+    Get the process-wide response cache, creating it on first use.
+
+    NBA_CACHE_BACKEND selects 'sqlite' (default, stored at NBA_CACHE_PATH) or
+    'redis' (connected to REDIS_URL).
+    """
+    global _cache
+    if _cache is None:
+        backend = os.getenv("NBA_CACHE_BACKEND", "sqlite").lower()
+        if backend == "redis":
+            _cache = ResponseCache(RedisBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0")))
+        else:
+            _cache = ResponseCache(SQLiteBackend(os.getenv("NBA_CACHE_PATH", "cache/nba_api.sqlite")))
+        logger.info("Using %s response cache", backend)
+    return _cache
+
+
+def reset_cache() -> None:
+    """Forget the process-wide cache so the next get_cache() opens its own connections, e.g. after a fork."""
+    global _cache
+    _cache = None
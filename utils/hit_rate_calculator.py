@@ -1,34 +1,104 @@
-from typing import Dict, List, Optional, Tuple
-import pandas as pd
+from typing import Dict, List, Optional
+import msgspec
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from data.data_loader import NBADataLoader
 import logging
+import os
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+
+    NUMBA = True
+except ImportError:
+    NUMBA = False
+
+if NUMBA:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _count_hits(values: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+        """Count how many values reach each threshold."""
+        hits = np.zeros(thresholds.size, dtype=np.int64)
+        for i in range(values.size):
+            value = values[i]
+            for t in range(thresholds.size):
+                hits[t] += value >= thresholds[t]
+        return hits
+else:
+    def _count_hits(values: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+        """Count how many values reach each threshold."""
+        return (values[:, None] >= thresholds[None, :]).sum(axis=0)
+
+class HitRate(msgspec.Struct):
+    fraction: str
+    percentage: float
+
+class HitRates(msgspec.Struct):
+    points: Dict[str, HitRate]
+    assists: Dict[str, HitRate]
+    rebounds: Dict[str, HitRate]
+    threes: Dict[str, HitRate]
+    steals: Dict[str, HitRate]
+    blocks: Dict[str, HitRate]
+
 class HitRateCalculator:
-    POINTS_THRESHOLDS = [10, 15, 20, 25, 30, 35]
-    ASSISTS_THRESHOLDS = [2, 4, 6, 8, 10]
-    REBOUNDS_THRESHOLDS = [4, 6, 8, 10, 12, 14, 16]
-    THREES_THRESHOLDS = [1, 2, 3, 4, 5, 6, 7, 8]
-    STEALS_THRESHOLDS = [1, 2, 3, 4]
-    BLOCKS_THRESHOLDS = [1, 2, 3, 4]
+    POINTS_THRESHOLDS = np.array([10, 15, 20, 25, 30, 35], dtype=np.float32)
+    ASSISTS_THRESHOLDS = np.array([2, 4, 6, 8, 10], dtype=np.float32)
+    REBOUNDS_THRESHOLDS = np.array([4, 6, 8, 10, 12, 14, 16], dtype=np.float32)
+    THREES_THRESHOLDS = np.array([1, 2, 3, 4, 5, 6, 7, 8], dtype=np.float32)
+    STEALS_THRESHOLDS = np.array([1, 2, 3, 4], dtype=np.float32)
+    BLOCKS_THRESHOLDS = np.array([1, 2, 3, 4], dtype=np.float32)
+
+    # (category, game log column, thresholds)
+    STAT_THRESHOLDS = (
+        ("points", "PTS", POINTS_THRESHOLDS),
+        ("assists", "AST", ASSISTS_THRESHOLDS),
+        ("rebounds", "REB", REBOUNDS_THRESHOLDS),
+        ("threes", "FG3M", THREES_THRESHOLDS),
+        ("steals", "STL", STEALS_THRESHOLDS),
+        ("blocks", "BLK", BLOCKS_THRESHOLDS),
+    )
+    STAT_COLUMNS = [column for _, column, _ in STAT_THRESHOLDS]
 
     @staticmethod
-    def calculate_hit_rate(values: List[float], threshold: float) -> Tuple[str, float]:
-        """Calculate hit rate for a given threshold."""
+    def calculate_hit_rate(values: np.ndarray, thresholds: np.ndarray) -> Dict[str, HitRate]:
+        """Calculate hit rates for every threshold at once."""
         try:
-            hits = sum(1 for value in values if value >= threshold)
             total_games = len(values)
-            hit_rate = (hits / total_games) * 100 if total_games > 0 else 0
-            return f"{hits}/{total_games}", hit_rate
+            hits = _count_hits(values, thresholds)
+            return {
+                f"{threshold:g}+": HitRate(
+                    fraction=f"{count}/{total_games}",
+                    percentage=round((count / total_games) * 100, 2) if total_games > 0 else 0
+                )
+                for threshold, count in zip(thresholds.tolist(), hits.tolist())
+            }
         except Exception as e:
-            logger.error(f"Error calculating hit rate: {str(e)}")
+            logger.error("Error calculating hit rate: %s", e)
             raise
 
     @staticmethod
-    def get_player_hit_rates(player_id: str, num_games: int = 10, season: Optional[str] = None) -> Dict:
+    def calculate_recent_hit_rates(game_logs: pa.Table, num_games: int) -> HitRates:
+        """Calculate hit rates for all categories over the last N games of a game log table."""
+        # Take the last N games by date; a season is small enough to sort fully
+        # (select_k_unstable also fails on empty tables)
+        order = pc.sort_indices(game_logs, sort_keys=[('GAME_DATE', 'descending')])
+        recent = game_logs.take(order[:num_games])
+        logger.info("Processing last %s games", recent.num_rows)
+
+        return HitRates(**{
+            category: HitRateCalculator.calculate_hit_rate(
+                recent[column].to_numpy().astype(np.float32), thresholds
+            )
+            for category, column, thresholds in HitRateCalculator.STAT_THRESHOLDS
+        })
+
+    @staticmethod
+    def get_player_hit_rates(player_id: str, num_games: int = 10, season: Optional[str] = None) -> HitRates:
         """
         Get hit rates for all statistical categories over the last N games.
         
@@ -38,97 +108,58 @@ class HitRateCalculator:
             season: NBA season in format '2023-24'. If None, uses current season.
         
         Returns:
-            Dictionary containing hit rates for all statistical categories
+            HitRates containing hit rates for all statistical categories
         """
         try:
-            # Get player game logs
-            game_logs = NBADataLoader.get_player_game_logs(player_id, season)
-            logger.info(f"Retrieved game logs for player {player_id}")
-            
-            if not game_logs or 'resultSets' not in game_logs:
-                logger.error(f"Invalid game logs format: {game_logs}")
-                raise ValueError("Invalid game logs data received from NBA API")
-
-            # Convert to pandas DataFrame for easier manipulation
-            try:
-                df = pd.DataFrame(game_logs['resultSets'][0]['rowSet'], 
-                                columns=game_logs['resultSets'][0]['headers'])
-                logger.info(f"Created DataFrame with {len(df)} games")
-            except Exception as e:
-                logger.error(f"Error creating DataFrame: {str(e)}")
-                raise ValueError(f"Error processing game logs: {str(e)}")
-
-            # Sort by game date and take last N games
-            df = df.sort_values('GAME_DATE', ascending=False).head(num_games)
-            logger.info(f"Processing last {len(df)} games")
-
-            hit_rates = {
-                "points": {},
-                "assists": {},
-                "rebounds": {},
-                "threes": {},
-                "steals": {},
-                "blocks": {}
-            }
-
-            # Calculate hit rates for each category
-            for threshold in HitRateCalculator.POINTS_THRESHOLDS:
-                fraction, percentage = HitRateCalculator.calculate_hit_rate(
-                    df['PTS'].astype(float).tolist(), threshold
-                )
-                hit_rates["points"][f"{threshold}+"] = {
-                    "fraction": fraction,
-                    "percentage": round(percentage, 2)
-                }
-
-            for threshold in HitRateCalculator.ASSISTS_THRESHOLDS:
-                fraction, percentage = HitRateCalculator.calculate_hit_rate(
-                    df['AST'].astype(float).tolist(), threshold
-                )
-                hit_rates["assists"][f"{threshold}+"] = {
-                    "fraction": fraction,
-                    "percentage": round(percentage, 2)
-                }
-
-            for threshold in HitRateCalculator.REBOUNDS_THRESHOLDS:
-                fraction, percentage = HitRateCalculator.calculate_hit_rate(
-                    df['REB'].astype(float).tolist(), threshold
-                )
-                hit_rates["rebounds"][f"{threshold}+"] = {
-                    "fraction": fraction,
-                    "percentage": round(percentage, 2)
-                }
-
-            for threshold in HitRateCalculator.THREES_THRESHOLDS:
-                fraction, percentage = HitRateCalculator.calculate_hit_rate(
-                    df['FG3M'].astype(float).tolist(), threshold
-                )
-                hit_rates["threes"][f"{threshold}+"] = {
-                    "fraction": fraction,
-                    "percentage": round(percentage, 2)
-                }
-
-            for threshold in HitRateCalculator.STEALS_THRESHOLDS:
-                fraction, percentage = HitRateCalculator.calculate_hit_rate(
-                    df['STL'].astype(float).tolist(), threshold
-                )
-                hit_rates["steals"][f"{threshold}+"] = {
-                    "fraction": fraction,
-                    "percentage": round(percentage, 2)
-                }
-
-            for threshold in HitRateCalculator.BLOCKS_THRESHOLDS:
-                fraction, percentage = HitRateCalculator.calculate_hit_rate(
-                    df['BLK'].astype(float).tolist(), threshold
-                )
-                hit_rates["blocks"][f"{threshold}+"] = {
-                    "fraction": fraction,
-                    "percentage": round(percentage, 2)
-                }
+            # Get the stat columns of the player's game logs
+            game_logs = NBADataLoader.get_player_game_log_table(
+                player_id, season, columns=['GAME_DATE'] + HitRateCalculator.STAT_COLUMNS
+            )
+            logger.info("Retrieved %s games for player %s", game_logs.num_rows, player_id)
 
+            hit_rates = HitRateCalculator.calculate_recent_hit_rates(game_logs, num_games)
             logger.info("Successfully calculated all hit rates")
             return hit_rates
 
         except Exception as e:
-            logger.error(f"Error in get_player_hit_rates: {str(e)}")
+            logger.error("Error in get_player_hit_rates: %s", e)
+            raise
+
+    @staticmethod
+    def get_many_player_hit_rates(
+        player_ids: List[str],
+        num_games: int = 10,
+        season: Optional[str] = None
+    ) -> Dict[str, HitRates]:
+        """
+        Get hit rates for several players from one league-wide game log.
+
+        Args:
+            player_ids: NBA player IDs
+            num_games: Number of most recent games to analyze per player
+            season: NBA season in format '2023-24'. If None, uses current season.
+
+        Returns:
+            Dictionary mapping each player ID to its hit rates
+        """
+        try:
+            ids = [int(player_id) for player_id in player_ids]
+            games = NBADataLoader.get_league_season_games(season).select(
+                ['PLAYER_ID', 'GAME_DATE'] + HitRateCalculator.STAT_COLUMNS
+            )
+            games = games.filter(
+                pc.is_in(games['PLAYER_ID'], value_set=pa.array(ids, type=games.schema.field('PLAYER_ID').type))
+            )
+            # League game log dates are ISO 'YYYY-MM-DD' text, which already sorts by date
+            logger.info("Retrieved %s games for %s players", games.num_rows, len(ids))
+
+            return {
+                str(player_id): HitRateCalculator.calculate_recent_hit_rates(
+                    games.filter(pc.equal(games['PLAYER_ID'], player_id)), num_games
+                )
+                for player_id in ids
+            }
+
+        except Exception as e:
+            logger.error("Error in get_many_player_hit_rates: %s", e)
             raise
@@ -1,17 +1,243 @@
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
-from data.data_loader import NBADataLoader
+import pyarrow as pa
+import pyarrow.compute as pc
+from data.data_loader import NBADataLoader, get_result_set, parse_game_dates
+from cachetools import TLRUCache
+from cachetools.keys import hashkey
+import functools
+import inspect
 import logging
+import threading
+import time
+
+try:
+    from numba import njit
+
+    NUMBA = True
+except ImportError:
+    NUMBA = False
+
+try:
+    import polars as pl
+
+    POLARS = True
+except ImportError:
+    POLARS = False
 
 logger = logging.getLogger(__name__)
 
+if NUMBA:
+    @njit(cache=True)
+    def _summary_stats(values: np.ndarray) -> Tuple[float, float, float, float, float]:
+        """Get the mean, population std, median, min and max of a stat column."""
+        n = values.size
+        if n == 0:
+            return np.nan, np.nan, np.nan, np.nan, np.nan
+        # Welford's running mean/variance alongside the running min and max
+        mean = 0.0
+        m2 = 0.0
+        lo = values[0]
+        hi = values[0]
+        for i in range(n):
+            value = values[i]
+            delta = value - mean
+            mean += delta / (i + 1)
+            m2 += delta * (value - mean)
+            lo = min(lo, value)
+            hi = max(hi, value)
+        middle = np.partition(values, n // 2)
+        median = middle[n // 2]
+        if n % 2 == 0:
+            median = (median + middle[:n // 2].max()) / 2
+        return mean, np.sqrt(m2 / n), median, lo, hi
+else:
+    def _summary_stats(values: np.ndarray) -> Tuple[float, float, float, float, float]:
+        """Get the mean, population std, median, min and max of a stat column."""
+        if values.size == 0:
+            return np.nan, np.nan, np.nan, np.nan, np.nan
+        return values.mean(), values.std(), np.median(values), values.min(), values.max()
+
+# (response label, game log column) reported by the home/away splits
+SPLIT_STATS = (
+    ("points", "PTS"),
+    ("assists", "AST"),
+    ("rebounds", "REB"),
+    ("threes", "FG3M"),
+    ("steals", "STL"),
+    ("blocks", "BLK"),
+)
+
+# Stat types accepted by the consistency score
+_VALID_STATS = frozenset({'PTS', 'AST', 'REB', 'FG3M', 'STL', 'BLK'})
+
+def _entry_expiry(key: Tuple, entry: Tuple[float, object], now: float) -> float:
+    """Expire a cache entry stored as (expires_at, value) at its own expires_at."""
+    return entry[0]
+
+# Parsed game log frames keyed on (player_id, season), stored as (expires_at, df)
+_df_cache = TLRUCache(maxsize=512, ttu=_entry_expiry, timer=time.time)
+_df_cache_lock = threading.Lock()
+
+def _build_df(player_id: str, season: Optional[str]) -> Tuple[float, pd.DataFrame]:
+    """Parse a player's game logs, returning them with the time their response leaves the response cache."""
+    game_logs = NBADataLoader.get_player_game_logs(player_id, season)
+    # A frame built from a stale copy has no fresh response to expire with, so it isn't kept
+    expires_at = NBADataLoader.get_player_game_logs.nba_endpoint.expires_at(player_id, season) or time.time()
+    logger.info("Retrieved game logs for player %s", player_id)
+
+    headers, rows = get_result_set(game_logs)
+    if not rows:
+        raise ValueError(f"No games found for player {player_id}")
+
+    # Build typed Arrow columns straight from the rows, skipping pandas' per-cell
+    # inference; ints and floats stay typed and missing values become nulls
+    columns = [pa.array(column) for column in zip(*rows)]
+    df = pa.table(columns, names=headers).to_pandas(types_mapper=pd.ArrowDtype)
+    df['GAME_DATE'] = parse_game_dates(df['GAME_DATE'])
+    # Home games read 'GSW vs. LAL' and away games 'GSW @ BOS'; the flag is stored once
+    # as a plain bool array for every analyzer to group on
+    is_home = pc.match_substring(pa.array(df['MATCHUP'].array), 'vs.')
+    df['is_home'] = pc.fill_null(is_home, False).to_numpy(zero_copy_only=False)
+    return expires_at, df.sort_values('GAME_DATE', ascending=False, kind='mergesort', ignore_index=True)
+
+def _load_df(player_id: str, season: Optional[str] = None) -> pd.DataFrame:
+    """
+    Get a player's game logs as a DataFrame sorted by date, most recent first.
+
+    Parsed frames are shared between the analyzers until their game log
+    response expires; callers get a copy they are free to modify.
+    """
+    return _cached_df(player_id, season).copy()
+
+def _load_pl(player_id: str, season: Optional[str] = None) -> "pl.DataFrame":
+    """Get a player's game logs as a Polars DataFrame sorted by date, most recent first."""
+    # The Arrow-backed columns convert without copying
+    return pl.from_pandas(_cached_df(player_id, season))
+
+def _cached_df(player_id: str, season: Optional[str]) -> pd.DataFrame:
+    return _cached_frame(player_id, season)[1]
+
+def _cached_frame(player_id: str, season: Optional[str]) -> Tuple[float, pd.DataFrame]:
+    """Get a player's parsed game logs with the time they expire, building them on a miss."""
+    key = (player_id, season)
+    with _df_cache_lock:
+        entry = _df_cache.get(key)
+    if entry is None:
+        entry = _build_df(player_id, season)
+        with _df_cache_lock:
+            _df_cache[key] = entry
+    return entry
+
+# Split of a side (home or away) without any games
+_NO_GAMES_SPLIT = {
+    "games_played": 0,
+    **{f"{column}_mean": 0.0 for _, column in SPLIT_STATS},
+    **{f"{column}_min": 0 for _, column in SPLIT_STATS},
+    **{f"{column}_max": 0 for _, column in SPLIT_STATS},
+}
+
+def _home_away_splits_pd(df: pd.DataFrame) -> Dict[bool, Dict]:
+    """Get games played and the mean/min/max of each split stat, keyed on is_home."""
+    grouped = df.groupby('is_home', sort=False)
+    splits = grouped[[column for _, column in SPLIT_STATS]].agg(['mean', 'min', 'max'])
+    splits.columns = [f"{column}_{metric}" for column, metric in splits.columns]
+    splits['games_played'] = grouped.size()
+    # to_dict boxes each value as a native Python scalar of its column's type
+    return splits.to_dict('index')
+
+def _home_away_splits_pl(df: "pl.DataFrame") -> Dict[bool, Dict]:
+    """Get games played and the mean/min/max of each split stat, keyed on is_home."""
+    columns = [column for _, column in SPLIT_STATS]
+    splits = df.group_by('is_home').agg(
+        [pl.len().alias('games_played')]
+        + [pl.col(columns).mean().name.suffix('_mean')]
+        + [pl.col(columns).min().name.suffix('_min')]
+        + [pl.col(columns).max().name.suffix('_max')]
+    )
+    return {row.pop('is_home'): row for row in splits.iter_rows(named=True)}
+
+def _with_game_log_df(error_message: str, polars: bool = False):
+    """
+    Pass an analyzer the player's game logs as a ready `df` keyword argument.
+
+    The wrapped method keeps its public signature without `df`. The frame is
+    loaded for the call's player_id and season, cut to last_n_games when the
+    method takes that argument, and failures are logged with error_message.
+    With polars=True the frame is a Polars DataFrame when Polars is installed.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        public = signature.replace(
+            parameters=[param for name, param in signature.parameters.items() if name != 'df']
+        )
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = public.bind(*args, **kwargs)
+            bound.apply_defaults()
+            try:
+                player_id, season = bound.arguments['player_id'], bound.arguments['season']
+                df = _load_pl(player_id, season) if polars and POLARS else _load_df(player_id, season)
+
+                last_n_games = bound.arguments.get('last_n_games')
+                if last_n_games:
+                    df = df.head(last_n_games)
+
+                return func(*bound.args, df=df, **bound.kwargs)
+            except Exception as e:
+                logger.error("%s: %s", error_message, e)
+                raise
+
+        wrapper.__signature__ = public
+        return wrapper
+    return decorator
+
+def _memoized():
+    """
+    Cache an analyzer's responses by its arguments.
+
+    Entries expire with the game log frame they were computed from, so a
+    repeated query skips the DataFrame work entirely but never outlives the
+    response cache. Cached responses are shared between callers and must not
+    be modified.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        cache = TLRUCache(maxsize=1024, ttu=_entry_expiry, timer=time.time)
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = hashkey(*bound.args, **bound.kwargs)
+            with lock:
+                entry = cache.get(key)
+            if entry is not None:
+                return entry[1]
+
+            # Read the frame's expiry first so the result can't outlive the frame it used
+            expires_at, _ = _cached_frame(bound.arguments['player_id'], bound.arguments['season'])
+            result = func(*args, **kwargs)
+            with lock:
+                cache[key] = (expires_at, result)
+            return result
+
+        return wrapper
+    return decorator
+
 class PropAnalyzer:
     @staticmethod
+    @_memoized()
+    @_with_game_log_df("Error in calculate_home_away_splits", polars=True)
     def calculate_home_away_splits(
         player_id: str, 
         season: Optional[str] = None,
-        last_n_games: Optional[int] = None
+        last_n_games: Optional[int] = None,
+        *,
+        df
     ) -> Dict:
         """
         Calculate performance splits between home and away games.
@@ -21,148 +247,41 @@ class PropAnalyzer:
             season: Optional season in format '2023-24'. If None, uses current season
             last_n_games: Optional, analyze only the last N games. If None, analyzes all games
         """
-        try:
-            game_logs = NBADataLoader.get_player_game_logs(player_id, season)
-            logger.info(f"Retrieved game logs for player {player_id}")
-            
-            if not game_logs or 'resultSets' not in game_logs:
-                logger.error(f"Invalid game logs format: {game_logs}")
-                raise ValueError("Invalid game logs data received from NBA API")
-            
-            # Extract the actual game data
-            try:
-                headers = game_logs['resultSets'][0]['headers']
-                rows = game_logs['resultSets'][0]['rowSet']
-                df = pd.DataFrame(rows, columns=headers)
-                df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
-                df = df.sort_values('GAME_DATE', ascending=False)
-                
-                if last_n_games:
-                    df = df.head(last_n_games)
-                
-                logger.info(f"Analyzing {len(df)} games")
-            except (KeyError, IndexError) as e:
-                logger.error(f"Error processing game logs data: {str(e)}")
-                raise ValueError(f"Error extracting game data: {str(e)}")
-            
-            # Convert numeric columns
-            numeric_cols = ['PTS', 'AST', 'REB', 'FG3M', 'STL', 'BLK']
-            for col in numeric_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Identify home/away games
-            df['is_home'] = df['MATCHUP'].str.contains('vs')
-            
-            # Calculate splits
-            try:
-                home_stats = df[df['is_home']].agg({
-                    'PTS': ['mean', 'min', 'max'],
-                    'AST': ['mean', 'min', 'max'],
-                    'REB': ['mean', 'min', 'max'],
-                    'FG3M': ['mean', 'min', 'max'],
-                    'STL': ['mean', 'min', 'max'],
-                    'BLK': ['mean', 'min', 'max']
-                }).round(1)
-                
-                away_stats = df[~df['is_home']].agg({
-                    'PTS': ['mean', 'min', 'max'],
-                    'AST': ['mean', 'min', 'max'],
-                    'REB': ['mean', 'min', 'max'],
-                    'FG3M': ['mean', 'min', 'max'],
-                    'STL': ['mean', 'min', 'max'],
-                    'BLK': ['mean', 'min', 'max']
-                }).round(1)
-                
-                # Format the response
-                result = {
-                    "home": {
-                        "games_played": int(len(df[df['is_home']])),
-                        "stats": {
-                            "points": {
-                                "avg": float(home_stats['PTS']['mean']),
-                                "min": int(home_stats['PTS']['min']),
-                                "max": int(home_stats['PTS']['max'])
-                            },
-                            "assists": {
-                                "avg": float(home_stats['AST']['mean']),
-                                "min": int(home_stats['AST']['min']),
-                                "max": int(home_stats['AST']['max'])
-                            },
-                            "rebounds": {
-                                "avg": float(home_stats['REB']['mean']),
-                                "min": int(home_stats['REB']['min']),
-                                "max": int(home_stats['REB']['max'])
-                            },
-                            "threes": {
-                                "avg": float(home_stats['FG3M']['mean']),
-                                "min": int(home_stats['FG3M']['min']),
-                                "max": int(home_stats['FG3M']['max'])
-                            },
-                            "steals": {
-                                "avg": float(home_stats['STL']['mean']),
-                                "min": int(home_stats['STL']['min']),
-                                "max": int(home_stats['STL']['max'])
-                            },
-                            "blocks": {
-                                "avg": float(home_stats['BLK']['mean']),
-                                "min": int(home_stats['BLK']['min']),
-                                "max": int(home_stats['BLK']['max'])
-                            }
-                        }
-                    },
-                    "away": {
-                        "games_played": int(len(df[~df['is_home']])),
-                        "stats": {
-                            "points": {
-                                "avg": float(away_stats['PTS']['mean']),
-                                "min": int(away_stats['PTS']['min']),
-                                "max": int(away_stats['PTS']['max'])
-                            },
-                            "assists": {
-                                "avg": float(away_stats['AST']['mean']),
-                                "min": int(away_stats['AST']['min']),
-                                "max": int(away_stats['AST']['max'])
-                            },
-                            "rebounds": {
-                                "avg": float(away_stats['REB']['mean']),
-                                "min": int(away_stats['REB']['min']),
-                                "max": int(away_stats['REB']['max'])
-                            },
-                            "threes": {
-                                "avg": float(away_stats['FG3M']['mean']),
-                                "min": int(away_stats['FG3M']['min']),
-                                "max": int(away_stats['FG3M']['max'])
-                            },
-                            "steals": {
-                                "avg": float(away_stats['STL']['mean']),
-                                "min": int(away_stats['STL']['min']),
-                                "max": int(away_stats['STL']['max'])
-                            },
-                            "blocks": {
-                                "avg": float(away_stats['BLK']['mean']),
-                                "min": int(away_stats['BLK']['min']),
-                                "max": int(away_stats['BLK']['max'])
-                            }
-                        }
+        logger.info("Analyzing %s games", len(df))
+        
+        splits = _home_away_splits_pl(df) if POLARS else _home_away_splits_pd(df)
+        
+        # Format the response; a side with no games reports zeros
+        result = {
+            side: {
+                "games_played": split["games_played"],
+                "stats": {
+                    label: {
+                        "avg": round(split[f"{column}_mean"], 1),
+                        "min": split[f"{column}_min"],
+                        "max": split[f"{column}_max"]
                     }
+                    for label, column in SPLIT_STATS
                 }
-                
-                logger.info("Successfully calculated home/away splits")
-                return result
-                
-            except Exception as e:
-                logger.error(f"Error calculating statistics: {str(e)}")
-                raise ValueError(f"Error calculating home/away splits: {str(e)}")
-            
-        except Exception as e:
-            logger.error(f"Error in calculate_home_away_splits: {str(e)}")
-            raise
+            }
+            for side, split in (
+                ("home", splits.get(True, _NO_GAMES_SPLIT)),
+                ("away", splits.get(False, _NO_GAMES_SPLIT))
+            )
+        }
+        
+        logger.info("Successfully calculated home/away splits")
+        return result
 
     @staticmethod
+    @_memoized()
+    @_with_game_log_df("Error calculating rest day impact")
     def calculate_rest_day_impact(
         player_id: str, 
         season: Optional[str] = None,
-        last_n_games: Optional[int] = None
+        last_n_games: Optional[int] = None,
+        *,
+        df: pd.DataFrame
     ) -> Dict:
         """
         Analyze performance based on days of rest.
@@ -172,53 +291,38 @@ class PropAnalyzer:
             season: Optional season in format '2023-24'. If None, uses current season
             last_n_games: Optional, analyze only the last N games. If None, analyzes all games
         """
-        try:
-            game_logs = NBADataLoader.get_player_game_logs(player_id, season)
-            df = pd.DataFrame(game_logs['resultSets'][0]['rowSet'], 
-                            columns=game_logs['resultSets'][0]['headers'])
-            
-            # Sort by date
-            df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
-            df = df.sort_values('GAME_DATE', ascending=False)
-            
-            if last_n_games:
-                df = df.head(last_n_games)
-            
-            logger.info(f"Analyzing {len(df)} games")
-            
-            # Calculate days between games
-            df['days_rest'] = df['GAME_DATE'].diff().dt.days - 1
-            df['days_rest'] = df['days_rest'].fillna(3)  # Assume 3 days rest for first game
-            
-            # Group by rest days
-            rest_groups = {
-                "back_to_back": df[df['days_rest'] == 0],
-                "one_day_rest": df[df['days_rest'] == 1],
-                "two_plus_days_rest": df[df['days_rest'] >= 2]
-            }
-            
-            stats = {}
-            for rest_type, group in rest_groups.items():
-                if len(group) > 0:
-                    stats[rest_type] = {
-                        "games_played": len(group),
-                        "avg_points": round(group['PTS'].mean(), 1),
-                        "avg_assists": round(group['AST'].mean(), 1),
-                        "avg_rebounds": round(group['REB'].mean(), 1),
-                        "avg_minutes": round(group['MIN'].mean(), 1)
-                    }
-            
-            return stats
-        except Exception as e:
-            logger.error(f"Error calculating rest day impact: {str(e)}")
-            raise
+        logger.info("Analyzing %s games", len(df))
+        
+        # Calculate days since the previous game; games are sorted most recent first
+        df['days_rest'] = (df['GAME_DATE'] - df['GAME_DATE'].shift(-1)).dt.days - 1
+        df['days_rest'] = df['days_rest'].fillna(3)  # Assume 3 days rest for first game
+        
+        # Group by rest days in one pass; empty groups are left out
+        rest_type = pd.cut(
+            df['days_rest'],
+            bins=[-1, 0, 1, np.inf],
+            labels=['back_to_back', 'one_day_rest', 'two_plus_days_rest']
+        )
+        stats = df.groupby(rest_type, observed=True).agg(
+            games_played=('PTS', 'size'),
+            avg_points=('PTS', 'mean'),
+            avg_assists=('AST', 'mean'),
+            avg_rebounds=('REB', 'mean'),
+            avg_minutes=('MIN', 'mean')
+        ).round(1).to_dict('index')
+        
+        return stats
 
     @staticmethod
+    @_memoized()
+    @_with_game_log_df("Error analyzing matchup history")
     def analyze_matchup_history(
         player_id: str, 
         opponent_team_id: str,
         season: Optional[str] = None,
-        last_n_matchups: int = 5
+        last_n_matchups: int = 5,
+        *,
+        df: pd.DataFrame
     ) -> Dict:
         """
         Analyze player's performance history against specific teams.
@@ -229,45 +333,47 @@ class PropAnalyzer:
             season: Optional season in format '2023-24'. If None, analyzes all available seasons
             last_n_matchups: Number of most recent matchups to analyze (default: 5)
         """
-        try:
-            game_logs = NBADataLoader.get_player_game_logs(player_id, season)
-            df = pd.DataFrame(game_logs['resultSets'][0]['rowSet'], 
-                            columns=game_logs['resultSets'][0]['headers'])
-            
-            # Filter games against specific opponent and sort by date
-            df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
-            opponent_games = df[df['MATCHUP'].str.contains(str(opponent_team_id))]
-            recent_games = opponent_games.sort_values('GAME_DATE', ascending=False).head(last_n_matchups)
-            
-            logger.info(f"Analyzing {len(recent_games)} games against opponent {opponent_team_id}")
-            
-            performance = {
-                "games_analyzed": len(recent_games),
-                "averages": {
-                    "points": round(recent_games['PTS'].mean(), 1),
-                    "assists": round(recent_games['AST'].mean(), 1),
-                    "rebounds": round(recent_games['REB'].mean(), 1),
-                    "minutes": round(recent_games['MIN'].mean(), 1),
-                    "threes": round(recent_games['FG3M'].mean(), 1)
-                },
-                "ranges": {
-                    "points": f"{int(recent_games['PTS'].min())}-{int(recent_games['PTS'].max())}",
-                    "assists": f"{int(recent_games['AST'].min())}-{int(recent_games['AST'].max())}",
-                    "rebounds": f"{int(recent_games['REB'].min())}-{int(recent_games['REB'].max())}",
-                }
+        # Filter games against specific opponent, keeping the most recent
+        opponent_games = df['MATCHUP'].str.contains(str(opponent_team_id), regex=False, na=False)
+        recent_games = df.iloc[np.flatnonzero(opponent_games.to_numpy(dtype=bool))[:last_n_matchups]]
+        
+        logger.info("Analyzing %s games against opponent %s", len(recent_games), opponent_team_id)
+        
+        if len(recent_games) == 0:
+            return {
+                "games_analyzed": 0,
+                "averages": {"points": 0.0, "assists": 0.0, "rebounds": 0.0, "minutes": 0.0, "threes": 0.0},
+                "ranges": {"points": "0-0", "assists": "0-0", "rebounds": "0-0"}
             }
-            
-            return performance
-        except Exception as e:
-            logger.error(f"Error analyzing matchup history: {str(e)}")
-            raise
+        
+        performance = {
+            "games_analyzed": len(recent_games),
+            "averages": {
+                "points": round(recent_games['PTS'].mean(), 1),
+                "assists": round(recent_games['AST'].mean(), 1),
+                "rebounds": round(recent_games['REB'].mean(), 1),
+                "minutes": round(recent_games['MIN'].mean(), 1),
+                "threes": round(recent_games['FG3M'].mean(), 1)
+            },
+            "ranges": {
+                "points": f"{int(recent_games['PTS'].min())}-{int(recent_games['PTS'].max())}",
+                "assists": f"{int(recent_games['AST'].min())}-{int(recent_games['AST'].max())}",
+                "rebounds": f"{int(recent_games['REB'].min())}-{int(recent_games['REB'].max())}",
+            }
+        }
+        
+        return performance
 
     @staticmethod
+    @_memoized()
+    @_with_game_log_df("Error calculating consistency score")
     def calculate_consistency_score(
         player_id: str, 
         stat_type: str,
         season: Optional[str] = None,
-        last_n_games: int = 20
+        last_n_games: int = 20,
+        *,
+        df: pd.DataFrame
     ) -> Dict:
         """
         Calculate a consistency score (0-100) for different statistical categories.
@@ -279,48 +385,51 @@ class PropAnalyzer:
             season: Optional season in format '2023-24'. If None, uses current season
             last_n_games: Number of most recent games to analyze (default: 20)
         """
-        try:
-            game_logs = NBADataLoader.get_player_game_logs(player_id, season)
-            df = pd.DataFrame(game_logs['resultSets'][0]['rowSet'], 
-                            columns=game_logs['resultSets'][0]['headers'])
-            
-            # Sort by date and take last N games
-            df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
-            recent_games = df.sort_values('GAME_DATE', ascending=False).head(last_n_games)
-            
-            logger.info(f"Analyzing consistency over {len(recent_games)} games")
-            
-            if stat_type not in ['PTS', 'AST', 'REB', 'FG3M', 'STL', 'BLK']:
-                raise ValueError("Invalid stat type")
-            
-            values = recent_games[stat_type].astype(float)
-            
-            # Calculate coefficient of variation (lower means more consistent)
-            cv = np.std(values) / np.mean(values) if np.mean(values) > 0 else float('inf')
-            
-            # Convert to 0-100 score (lower cv = higher score)
-            consistency_score = max(0, min(100, 100 * (1 - cv)))
-            
-            # Calculate additional metrics
-            result = {
-                "consistency_score": round(consistency_score, 1),
-                "average": round(np.mean(values), 1),
-                "std_dev": round(np.std(values), 1),
-                "median": round(np.median(values), 1),
-                "range": f"{int(min(values))}-{int(max(values))}",
-                "games_analyzed": len(values)
+        logger.info("Analyzing consistency over %s games", len(df))
+        
+        if stat_type not in _VALID_STATS:
+            raise ValueError("Invalid stat type")
+        
+        values = df[stat_type].to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return {
+                "consistency_score": 0.0,
+                "average": 0.0,
+                "std_dev": 0.0,
+                "median": 0.0,
+                "range": "0-0",
+                "games_analyzed": 0
             }
-            
-            return result
-        except Exception as e:
-            logger.error(f"Error calculating consistency score: {str(e)}")
-            raise
+        
+        mean, std, median, lowest, highest = _summary_stats(values)
+        
+        # Calculate coefficient of variation (lower means more consistent)
+        cv = std / mean if mean > 0 else float('inf')
+        
+        # Convert to 0-100 score (lower cv = higher score)
+        consistency_score = max(0, min(100, 100 * (1 - cv)))
+        
+        # Calculate additional metrics
+        result = {
+            "consistency_score": round(consistency_score, 1),
+            "average": round(mean, 1),
+            "std_dev": round(std, 1),
+            "median": round(median, 1),
+            "range": f"{int(lowest)}-{int(highest)}",
+            "games_analyzed": len(values)
+        }
+        
+        return result
 
     @staticmethod
+    @_memoized()
+    @_with_game_log_df("Error analyzing pace impact")
     def analyze_pace_impact(
         player_id: str,
         season: Optional[str] = None,
-        last_n_games: int = 20
+        last_n_games: int = 20,
+        *,
+        df: pd.DataFrame
     ) -> Dict:
         """
         Analyze performance in different pace scenarios.
@@ -330,44 +439,41 @@ class PropAnalyzer:
             season: Optional season in format '2023-24'. If None, uses current season
             last_n_games: Number of most recent games to analyze (default: 20)
         """
-        try:
-            game_logs = NBADataLoader.get_player_game_logs(player_id, season)
-            df = pd.DataFrame(game_logs['resultSets'][0]['rowSet'], 
-                            columns=game_logs['resultSets'][0]['headers'])
-            
-            # Sort by date and take last N games
-            df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
-            recent_games = df.sort_values('GAME_DATE', ascending=False).head(last_n_games)
-            
-            logger.info(f"Analyzing pace impact over {len(recent_games)} games")
-            
-            # Calculate possessions (rough estimate)
-            recent_games['POSS'] = recent_games['FGA'] - recent_games['OREB'] + recent_games['TOV']
-            
-            # Define pace categories
-            pace_threshold_high = recent_games['POSS'].quantile(0.67)
-            pace_threshold_low = recent_games['POSS'].quantile(0.33)
-            
-            pace_groups = {
-                "high_pace": recent_games[recent_games['POSS'] >= pace_threshold_high],
-                "medium_pace": recent_games[(recent_games['POSS'] < pace_threshold_high) & 
-                                         (recent_games['POSS'] > pace_threshold_low)],
-                "low_pace": recent_games[recent_games['POSS'] <= pace_threshold_low]
+        logger.info("Analyzing pace impact over %s games", len(df))
+        
+        # Calculate possessions (rough estimate)
+        poss = np.subtract(
+            df['FGA'].to_numpy(dtype=np.float64, na_value=np.nan),
+            df['OREB'].to_numpy(dtype=np.float64, na_value=np.nan)
+        )
+        np.add(poss, df['TOV'].to_numpy(dtype=np.float64, na_value=np.nan), out=poss)
+        # Games missing any of the box score columns cannot be placed by pace
+        known = ~np.isnan(poss)
+        poss = poss[known]
+        if len(poss) == 0:
+            return {}
+        recent_games = df[known].assign(POSS=poss)
+        
+        # Define pace categories: 0 below the 33rd percentile, 2 from the 67th up, 1 in between
+        pace_threshold_low, pace_threshold_high = np.quantile(poss, [0.33, 0.67])
+        pace = np.digitize(poss, [pace_threshold_low, pace_threshold_high])
+        
+        grouped = recent_games.groupby(pace, sort=False)
+        # to_dict boxes each value as a native Python scalar, with None for missing averages
+        averages = grouped[['PTS', 'AST', 'REB', 'MIN', 'POSS']].mean().round(1).to_dict('index')
+        games_played = grouped.size()
+        
+        stats = {
+            pace_type: {
+                "games_played": games_played[category].item(),
+                "avg_points": averages[category]['PTS'],
+                "avg_assists": averages[category]['AST'],
+                "avg_rebounds": averages[category]['REB'],
+                "avg_minutes": averages[category]['MIN'],
+                "avg_possessions": averages[category]['POSS']
             }
-            
-            stats = {}
-            for pace_type, group in pace_groups.items():
-                if len(group) > 0:
-                    stats[pace_type] = {
-                        "games_played": len(group),
-                        "avg_points": round(group['PTS'].mean(), 1),
-                        "avg_assists": round(group['AST'].mean(), 1),
-                        "avg_rebounds": round(group['REB'].mean(), 1),
-                        "avg_minutes": round(group['MIN'].mean(), 1),
-                        "avg_possessions": round(group['POSS'].mean(), 1)
-                    }
-            
-            return stats
-        except Exception as e:
-            logger.error(f"Error analyzing pace impact: {str(e)}")
-            raise
+            for pace_type, category in (("high_pace", 2), ("medium_pace", 1), ("low_pace", 0))
+            if category in averages
+        }
+        
+        return stats